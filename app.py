@@ -1,86 +1,406 @@
 from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
 from espn_api.football import League
 from flask_cors import CORS
+from flask_caching import Cache
 import os
+import re
+import sys
+import orjson
+from dataclasses import dataclass, replace
+from operator import attrgetter
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, used by jsonify and request.get_json"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response without a str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure CORS to allow requests from Go backend
 CORS(app, resources={r"/api/*": {"origins": "http://localhost:8080"}})
 
-# Default credentials (can be overridden via request headers or environment)
-YOUR_LEAGUE_ID = int(os.getenv('ESPN_LEAGUE_ID', 929602296))
-YOUR_TEAM_ID = int(os.getenv('ESPN_TEAM_ID', 10))
-YOUR_YEAR = int(os.getenv('ESPN_YEAR', 2025))
-YOUR_ESPN_S2 = os.getenv('ESPN_S2', 'AEANF5s/YFx8uRBzF0ySSDkyZkZVNuQ95avS3MuJaOMoWTdXFYiRItuIfiDSE/EADpCTJYbypKBuEva4kJ6+3kj/G58wrOwlk+HiORhAHPQeZ/ibNioe6PRhLjSLMttbmV2PKL6SjFT87LpLTYlgYL9Pw3cm32NNS8740CFpIbsUUBGLJ0Ry6dpXGL/dxMhX7AmhmdwQhfV7LsopKrI6tR/YD2NUCxTfs722KQHg0f64uSK3zdXAtNM8wNAkc7K1WsWCY1g35RHzE8esgza5WXwVcld3X7pAdGX6Wa1fn34OPA==')
-YOUR_SWID = os.getenv('ESPN_SWID', '{06B8EDC1-CAAD-40F0-A6AB-22C15EDF791B}')
+# Response cache for the read endpoints; set REDIS_URL to share it across gunicorn workers
+if os.getenv('REDIS_URL'):
+    cache = Cache(app, config={'CACHE_TYPE': 'RedisCache', 'CACHE_REDIS_URL': os.getenv('REDIS_URL')})
+else:
+    cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
 
-def get_league_and_team():
-    """Helper function to initialize league and get team"""
-    league = League(
-        league_id=YOUR_LEAGUE_ID,
-        year=YOUR_YEAR,
-        espn_s2=YOUR_ESPN_S2,
-        swid=YOUR_SWID
-    )
+def cache_get(key):
+    """Read from the cache, treating a backend error (e.g. Redis down) as a miss"""
+    try:
+        return cache.get(key)
+    except Exception:
+        app.logger.exception('Cache read failed for %s', key)
+        return None
+
+def cache_set(key, value, timeout):
+    """Write to the cache, ignoring backend errors so callers still get their value"""
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception:
+        app.logger.exception('Cache write failed for %s', key)
+
+def _env_int(name, default=None):
+    """Read an integer setting at import so a missing or malformed value fails on startup"""
+    value = os.getenv(name)
+    if value is None or value == '':
+        if default is None:
+            raise RuntimeError(f'{name} must be set')
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise RuntimeError(f'{name} must be an integer, got {value!r}') from None
+
+# League settings come from the environment; ESPN_S2/ESPN_SWID are only needed for private leagues
+YOUR_LEAGUE_ID = _env_int('ESPN_LEAGUE_ID')
+YOUR_TEAM_ID = _env_int('ESPN_TEAM_ID')
+YOUR_YEAR = _env_int('ESPN_YEAR', 2025)
+YOUR_ESPN_S2 = os.getenv('ESPN_S2') or None
+YOUR_SWID = os.getenv('ESPN_SWID') or None
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+# League constructor arguments and cache key, built once at import
+_LEAGUE_KWARGS = dict(
+    league_id=YOUR_LEAGUE_ID,
+    year=YOUR_YEAR,
+    espn_s2=YOUR_ESPN_S2,
+    swid=YOUR_SWID
+)
+_LEAGUE_KEY = (YOUR_LEAGUE_ID, YOUR_YEAR)
+_ROSTER_CACHE_KEY = f'espn:roster:{YOUR_LEAGUE_ID}:{YOUR_YEAR}:{YOUR_TEAM_ID}'
+_WEEK_CACHE_KEY = f'espn:week:{YOUR_LEAGUE_ID}:{YOUR_YEAR}'
+
+# Pooled keep-alive session so Gemini calls reuse TCP/TLS connections
+_gemini_session = requests.Session()
+_gemini_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# How long a fetched League is reused before hitting ESPN again (seconds)
+LEAGUE_CACHE_TTL = _env_int('ESPN_LEAGUE_CACHE_TTL', 60)
+# Past this many TTLs a stale league is no longer served; the request fetches inline instead
+LEAGUE_MAX_STALE_TTLS = 5
+# Wait between background refresh attempts after one fails (seconds)
+LEAGUE_REFRESH_BACKOFF = 30
+
+_league_cache = {}
+_league_refreshing = set()
+_league_retry_at = {}
+_league_cache_lock = threading.Lock()
+
+def _fetch_league():
+    league = League(**_LEAGUE_KWARGS)
+    # Index teams once per fetch so per-request lookups are a dict probe
+    league._team_by_id = {t.team_id: t for t in league.teams}
+    return league
+
+def _refresh_league(key):
+    """Re-fetch a stale league in the background and swap it into the cache"""
+    try:
+        league = _fetch_league()
+    except Exception:
+        app.logger.exception('Background refresh of ESPN league %s failed', key)
+        with _league_cache_lock:
+            _league_retry_at[key] = time.monotonic() + LEAGUE_REFRESH_BACKOFF
+            _league_refreshing.discard(key)
+        return
+    
+    with _league_cache_lock:
+        _league_cache[key] = (time.monotonic(), league)
+        _league_retry_at.pop(key, None)
+        _league_refreshing.discard(key)
+
+def get_league_cached():
+    """Return a League for the configured league/year, refreshed every LEAGUE_CACHE_TTL seconds.
+    
+    A stale league keeps being served while a background thread re-fetches it,
+    so only the first request after startup waits on ESPN. Failed refreshes back
+    off for LEAGUE_REFRESH_BACKOFF seconds, and once the league is older than
+    LEAGUE_MAX_STALE_TTLS TTLs it is fetched inline so an ESPN outage surfaces
+    as an error instead of silently old data.
+    """
+    key = _LEAGUE_KEY
+    with _league_cache_lock:
+        cached = _league_cache.get(key)
+        if cached:
+            now = time.monotonic()
+            age = now - cached[0]
+            if age < LEAGUE_CACHE_TTL:
+                return cached[1]
+            
+            if age < LEAGUE_CACHE_TTL * LEAGUE_MAX_STALE_TTLS:
+                if key not in _league_refreshing and now >= _league_retry_at.get(key, 0):
+                    _league_refreshing.add(key)
+                    threading.Thread(target=_refresh_league, args=(key,), daemon=True).start()
+                return cached[1]
+        
+        league = _fetch_league()
+        _league_cache[key] = (time.monotonic(), league)
+        _league_retry_at.pop(key, None)
+        return league
+
+class _InflightCall:
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def singleflight(key, fn):
+    """Run fn once per key at a time; concurrent callers with the same key wait for and share its result"""
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _InflightCall()
+    
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
     
-    team = None
-    for t in league.teams:
-        if t.team_id == YOUR_TEAM_ID:
-            team = t
-            break
+    try:
+        call.result = fn()
+        return call.result
+    except BaseException as e:
+        # Record anything, including BaseException, so waiters re-raise instead of returning None
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
+
+def get_league_and_team():
+    """Helper function to get the cached league and team"""
+    league = get_league_cached()
     
+    team = league._team_by_id.get(YOUR_TEAM_ID)
     if not team:
         return None, None, f'Team with ID {YOUR_TEAM_ID} not found'
     
     return league, team, None
 
+@dataclass(slots=True)
+class RosterPlayer:
+    """JSON record for a rostered player (serialized field-for-field by orjson)"""
+    name: str
+    position: str
+    proTeam: str
+    lineupSlot: str
+    eligibleSlots: list
+    projectedPoints: float
+    points: float
+    injured: bool
+    injuryStatus: str | None
+    playerId: int | None
+    recommendedSlot: str | None = None
+
+@dataclass(slots=True)
+class FreeAgent:
+    """JSON record for a free agent (serialized field-for-field by orjson)"""
+    name: str
+    position: str
+    proTeam: str
+    projectedPoints: float
+    points: float
+    injured: bool
+    injuryStatus: str | None
+    playerId: int | None
+    percentOwned: float
+    percentStarted: float
+
+def get_week_points(player, week):
+    """Return (projected, actual) points for a week, falling back to season averages"""
+    week_stats = (getattr(player, 'stats', None) or {}).get(week) or {}
+    projected = week_stats.get('projected_points') or getattr(player, 'projected_avg_points', 0) or 0
+    actual = week_stats.get('points') or getattr(player, 'avg_points', 0) or 0
+    return projected, actual
+
+def build_player_record(player, week):
+    """Helper function to build the record for a rostered player"""
+    projected, actual = get_week_points(player, week)
+    return RosterPlayer(
+        name=player.name,
+        position=player.position,
+        proTeam=player.proTeam,
+        lineupSlot=player.lineupSlot,
+        eligibleSlots=player.eligibleSlots,
+        projectedPoints=projected,
+        points=actual,
+        injured=getattr(player, 'injured', False),
+        injuryStatus=getattr(player, 'injuryStatus', None),
+        playerId=getattr(player, 'playerId', None)
+    )
+
+# ESPN's FLEX slot; build_lineup interns each position it reads so the slot and FLEX
+# lookups below can match by identity first
+_FLEX_SLOT = sys.intern('RB/WR/TE')
+
+# Lineup requirements (typical ESPN lineup)
+_LINEUP_SLOTS = {
+    'QB': 1,
+    'RB': 2,
+    'WR': 2,
+    'TE': 1,
+    _FLEX_SLOT: 1,
+    sys.intern('D/ST'): 1,  # not an identifier, so not interned automatically
+    'K': 1
+}
+
+# Positions eligible for the FLEX slot, and injury statuses that always sit
+_FLEX_POSITIONS = frozenset(map(sys.intern, ('RB', 'WR', 'TE')))
+_OUT_STATUSES = frozenset(('OUT', 'IR'))
+
+_projected_points = attrgetter('projectedPoints')
+
+def build_lineup(roster_data):
+    """Greedily fill the starting lineup from player records, highest projection first.
+    
+    The input records are left untouched; the lineup and bench hold copies with recommendedSlot set.
+    """
+    # Sort by projected points (highest first)
+    players = sorted(roster_data, key=_projected_points, reverse=True)
+    
+    optimal_lineup = []
+    benched = []
+    total_projected = 0
+    open_slots = _LINEUP_SLOTS.copy()
+    
+    # Single pass: position slot first, then FLEX, otherwise bench
+    for player in players:
+        # Records usually come back unpickled from the cache, so intern here rather than on ingest
+        position = sys.intern(player.position)
+        slot = 'BE'
+        if player.injured and player.injuryStatus in _OUT_STATUSES:
+            pass
+        elif open_slots.get(position, 0) > 0:
+            slot = position
+        elif position in _FLEX_POSITIONS and open_slots[_FLEX_SLOT] > 0 and _FLEX_SLOT in player.eligibleSlots:
+            slot = _FLEX_SLOT
+        
+        # Emit a copy; the input records may be shared with other requests
+        player = replace(player, recommendedSlot=slot)
+        if slot == 'BE':
+            benched.append(player)
+        else:
+            open_slots[slot] -= 1
+            optimal_lineup.append(player)
+            total_projected += player.projectedPoints
+    
+    return {
+        'optimalLineup': optimal_lineup,
+        'bench': benched,
+        'totalProjected': total_projected
+    }
+
+# How long built roster records are shared through the cache (seconds)
+ROSTER_CACHE_TTL = 60
+# The week only changes weekly, so it can be cached longer than rosters
+WEEK_CACHE_TTL = 300
+
+def get_current_week():
+    """Helper function to get the league's current week from the cache"""
+    week = cache_get(_WEEK_CACHE_KEY)
+    if week is None:
+        week = get_league_cached().current_week
+        cache_set(_WEEK_CACHE_KEY, week, WEEK_CACHE_TTL)
+    return week
+
+# How long cached view responses are kept (seconds)
+VIEW_CACHE_TTL = 30
+FREE_AGENT_CACHE_TTL = 60
+
+def cached_json_view(key, build, timeout):
+    """Serve a JSON view from the cache, calling build() on a miss.
+    
+    build returns (payload, error); the payload is serialized once and the bytes
+    cached, while an error becomes a 404 and is not cached. Any exception from
+    build propagates to the view's own handler.
+    """
+    body = cache_get(key)
+    if body is None:
+        payload, error = build()
+        if error:
+            return jsonify({'error': error}), 404
+        body = orjson.dumps(payload)
+        cache_set(key, body, timeout)
+    return app.response_class(body, mimetype='application/json')
+
+def team_json_view(build_payload):
+    """Serve a team view whose payload is build_payload(roster_data), cached per week"""
+    current_week = get_current_week()
+    
+    def build():
+        roster_data, error = get_roster_data(current_week)
+        if error:
+            return None, error
+        return build_payload(roster_data), None
+    
+    # Scoped to the week so entries turn over as soon as the week rolls over
+    key = f'espn:view:{request.path}:{YOUR_LEAGUE_ID}:{YOUR_YEAR}:{YOUR_TEAM_ID}:{current_week}'
+    return cached_json_view(key, build, VIEW_CACHE_TTL)
+
+def get_roster_data(week):
+    """Helper function to build player records for the configured team.
+    
+    The records are kept in the shared cache, so with Redis only one worker
+    per TTL window has to load the league from ESPN.
+    """
+    roster_key = f'{_ROSTER_CACHE_KEY}:{week}'
+    roster_data = cache_get(roster_key)
+    if roster_data is not None:
+        return roster_data, None
+    
+    # Concurrent cache misses share one build instead of each walking the league
+    return singleflight(roster_key, lambda: _build_roster_data(week, roster_key))
+
+def _build_roster_data(week, roster_key):
+    league, team, error = get_league_and_team()
+    if error:
+        return None, error
+    
+    roster_data = [build_player_record(player, week) for player in team.roster]
+    cache_set(roster_key, roster_data, ROSTER_CACHE_TTL)
+    return roster_data, None
+
+def build_dashboard(roster_data):
+    """Helper function to combine the roster and its optimal lineup into one payload"""
+    lineup = build_lineup(roster_data)
+    return {
+        'roster': roster_data,
+        'optimalLineup': lineup['optimalLineup'],
+        'bench': lineup['bench'],
+        'totalProjected': lineup['totalProjected']
+    }
+
 @app.route('/api/espn/roster', methods=['GET'])
 def get_my_roster():
     try:
-        league, team, error = get_league_and_team()
-        if error:
-            return jsonify({'error': error}), 404
-        
-        # Get current week for projections
-        current_week = league.current_week
-        
-        # Create roster data list with projected and actual points
-        roster_data = []
-        for player in team.roster:
-            # Get projected points for current week
-            projected = 0
-            actual = 0
-            try:
-                if hasattr(player, 'stats') and current_week in player.stats:
-                    projected = player.stats[current_week].get('projected_points', 0)
-                    actual = player.stats[current_week].get('points', 0)
-                # Fallback to season averages
-                if projected == 0:
-                    projected = getattr(player, 'projected_avg_points', 0)
-                if actual == 0:
-                    actual = getattr(player, 'avg_points', 0)
-            except:
-                projected = getattr(player, 'projected_avg_points', 0)
-                actual = getattr(player, 'avg_points', 0)
-            
-            player_data = {
-                'name': player.name,
-                'position': player.position,
-                'proTeam': player.proTeam,
-                'lineupSlot': player.lineupSlot,
-                'projectedPoints': projected,
-                'points': actual,
-                'injured': getattr(player, 'injured', False),
-                'injuryStatus': getattr(player, 'injuryStatus', None),
-            }
-            roster_data.append(player_data)
-        
-        return jsonify(roster_data)
+        return team_json_view(lambda roster_data: roster_data)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -88,154 +408,114 @@ def get_my_roster():
 @app.route('/api/espn/optimize-lineup', methods=['GET'])
 def optimize_lineup():
     try:
-        league, team, error = get_league_and_team()
-        if error:
-            return jsonify({'error': error}), 404
-        
-        current_week = league.current_week
-        
-        # Get all players with their projections
-        players = []
-        for player in team.roster:
-            projected = 0
-            try:
-                if hasattr(player, 'stats') and current_week in player.stats:
-                    projected = player.stats[current_week].get('projected_points', 0)
-                if projected == 0:
-                    projected = getattr(player, 'projected_avg_points', 0)
-            except:
-                projected = getattr(player, 'projected_avg_points', 0)
-            
-            players.append({
-                'name': player.name,
-                'position': player.position,
-                'proTeam': player.proTeam,
-                'lineupSlot': player.lineupSlot,
-                'eligibleSlots': player.eligibleSlots,
-                'projectedPoints': projected,
-                'injured': getattr(player, 'injured', False),
-                'injuryStatus': getattr(player, 'injuryStatus', None),
-                'playerId': getattr(player, 'playerId', None)
-            })
-        
-        # Sort by projected points (highest first)
-        players.sort(key=lambda x: x['projectedPoints'], reverse=True)
-        
-        # Define lineup requirements (typical ESPN lineup)
-        lineup_slots = {
-            'QB': 1,
-            'RB': 2,
-            'WR': 2,
-            'TE': 1,
-            'RB/WR/TE': 1,  # FLEX
-            'D/ST': 1,
-            'K': 1
-        }
-        
-        optimal_lineup = []
-        benched = []
-        filled_slots = {slot: 0 for slot in lineup_slots.keys()}
-        
-        # First pass: Fill position-specific slots
-        for player in players:
-            if player['injured'] and player['injuryStatus'] in ['OUT', 'IR']:
-                player['recommendedSlot'] = 'BE'
-                benched.append(player)
-                continue
-            
-            # Try to place in specific position slot
-            if player['position'] in lineup_slots and filled_slots[player['position']] < lineup_slots[player['position']]:
-                player['recommendedSlot'] = player['position']
-                filled_slots[player['position']] += 1
-                optimal_lineup.append(player)
-            else:
-                # Check if eligible for flex
-                if 'RB/WR/TE' in player['eligibleSlots'] and filled_slots['RB/WR/TE'] < lineup_slots['RB/WR/TE']:
-                    if player['position'] in ['RB', 'WR', 'TE']:
-                        player['recommendedSlot'] = 'RB/WR/TE'
-                        filled_slots['RB/WR/TE'] += 1
-                        optimal_lineup.append(player)
-                    else:
-                        player['recommendedSlot'] = 'BE'
-                        benched.append(player)
-                else:
-                    player['recommendedSlot'] = 'BE'
-                    benched.append(player)
-        
-        return jsonify({
-            'optimalLineup': optimal_lineup,
-            'bench': benched,
-            'totalProjected': sum(p['projectedPoints'] for p in optimal_lineup)
-        })
+        return team_json_view(build_lineup)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/espn/dashboard', methods=['GET'])
+def get_dashboard():
+    """Roster and optimal lineup from a single pass over the team, for pages that show both"""
+    try:
+        return team_json_view(build_dashboard)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Upper bound on the free agents a single request may page through
+MAX_FREE_AGENTS = 200
+
+def build_free_agent_record(player, week):
+    """Helper function to build the record for a free agent"""
+    projected, actual = get_week_points(player, week)
+    return FreeAgent(
+        name=player.name,
+        position=player.position,
+        proTeam=player.proTeam,
+        projectedPoints=projected,
+        points=actual,
+        injured=getattr(player, 'injured', False),
+        injuryStatus=getattr(player, 'injuryStatus', 'ACTIVE'),
+        playerId=getattr(player, 'playerId', None),
+        percentOwned=getattr(player, 'percent_owned', 0),
+        percentStarted=getattr(player, 'percent_started', 0)
+    )
+
 @app.route('/api/espn/free-agents', methods=['GET'])
 def get_free_agents():
     try:
-        league, team, error = get_league_and_team()
-        if error:
-            return jsonify({'error': error}), 404
-        
         # Get query parameters
         position = request.args.get('position', None)  # Filter by position (QB, RB, WR, TE, K, D/ST)
-        size = int(request.args.get('size', 50))  # Number of results (default 50)
+        size = request.args.get('size', 50, type=int)  # Number of results (default 50)
+        size = max(1, min(size, MAX_FREE_AGENTS))
         
         # Handle empty string as None
         if position == '':
             position = None
         
-        current_week = league.current_week
-        
-        # Get free agents from the league
-        # ESPN API provides free_agents method
-        free_agents = league.free_agents(size=size, position=position)
+        current_week = get_current_week()
         
-        # Process free agent data
-        free_agent_data = []
-        for player in free_agents:
-            projected = 0
-            actual = 0
-            try:
-                if hasattr(player, 'stats') and current_week in player.stats:
-                    projected = player.stats[current_week].get('projected_points', 0)
-                    actual = player.stats[current_week].get('points', 0)
-                if projected == 0:
-                    projected = getattr(player, 'projected_avg_points', 0)
-                if actual == 0:
-                    actual = getattr(player, 'avg_points', 0)
-            except:
-                projected = getattr(player, 'projected_avg_points', 0)
-                actual = getattr(player, 'avg_points', 0)
+        def build():
+            league, team, error = get_league_and_team()
+            if error:
+                return None, error
             
-            player_data = {
-                'name': player.name,
-                'position': player.position,
-                'proTeam': player.proTeam,
-                'projectedPoints': projected,
-                'points': actual,
-                'injured': getattr(player, 'injured', False),
-                'injuryStatus': getattr(player, 'injuryStatus', 'ACTIVE'),
-                'playerId': getattr(player, 'playerId', None),
-                'percentOwned': getattr(player, 'percent_owned', 0),
-                'percentStarted': getattr(player, 'percent_started', 0),
-            }
-            free_agent_data.append(player_data)
+            # Get free agents from the league
+            # ESPN API provides free_agents method; identical concurrent requests share one fetch
+            free_agents = singleflight(
+                ('free_agents', position, size),
+                lambda: league.free_agents(size=size, position=position)
+            )
+            
+            free_agent_data = [build_free_agent_record(player, current_week) for player in free_agents]
+            return {
+                'players': free_agent_data,
+                'count': len(free_agent_data)
+            }, None
         
-        return jsonify({
-            'players': free_agent_data,
-            'count': len(free_agent_data)
-        })
+        # Keyed on the normalized parameters so equivalent query strings share an entry
+        key = f'espn:view:{request.path}:{YOUR_LEAGUE_ID}:{YOUR_YEAR}:{current_week}:{position}:{size}'
+        return cached_json_view(key, build, FREE_AGENT_CACHE_TTL)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# One "FIELD: value" line of the structured Gemini start/sit answer
+_AI_FIELD = re.compile(r'^[ \t]*(RECOMMENDATION|CONFIDENCE|REASONING):[ \t]*(.*?)\s*$', re.MULTILINE)
+_AI_FIELD_NAMES = frozenset(('RECOMMENDATION', 'CONFIDENCE', 'REASONING'))
+
+def has_all_ai_fields(ai_text):
+    """True once every field has appeared on a completed line of a partial response"""
+    complete_lines = ai_text[:ai_text.rfind('\n') + 1]
+    return {match.group(1) for match in _AI_FIELD.finditer(complete_lines)} == _AI_FIELD_NAMES
+
+def parse_ai_advice(ai_text):
+    """Extract (recommendation, confidence, reasoning) from Gemini's structured response"""
+    recommendation = 'A'
+    confidence = 50
+    reasoning = ai_text
+    
+    for match in _AI_FIELD.finditer(ai_text):
+        field, value = match.groups()
+        if field == 'RECOMMENDATION':
+            rec = value.upper()
+            if 'A' in rec:
+                recommendation = 'A'
+            elif 'B' in rec:
+                recommendation = 'B'
+        elif field == 'CONFIDENCE':
+            try:
+                confidence = int(value.replace('%', ''))
+            except ValueError:
+                pass
+        else:
+            reasoning = value
+    
+    return recommendation, confidence, reasoning
+
 @app.route('/api/espn/ai-start-sit', methods=['POST'])
 def ai_start_sit_advice():
     try:
-        import requests
-        
         data = request.get_json()
         player_a = data.get('playerA')
         player_b = data.get('playerB')
@@ -270,11 +550,11 @@ REASONING: [2-3 sentences explaining your choice, focusing on projected points,
 Be concise and direct."""
 
         # Call Gemini API
-        gemini_api_key = os.getenv('GEMINI_API_KEY')
-        if not gemini_api_key:
+        if not GEMINI_API_KEY:
             return jsonify({'error': 'Gemini API key not configured'}), 500
         
-        gemini_url = f'https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent?key={gemini_api_key}'
+        # Stream the answer so we can stop reading once every field has arrived
+        gemini_url = f'https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:streamGenerateContent?alt=sse&key={GEMINI_API_KEY}'
         
         gemini_request = {
             'contents': [{
@@ -287,41 +567,32 @@ Be concise and direct."""
             }
         }
         
-        response = requests.post(gemini_url, json=gemini_request, timeout=30)
-        
-        if response.status_code != 200:
-            return jsonify({'error': f'Gemini API error: {response.text}'}), 500
-        
-        gemini_response = response.json()
+        # Fail fast on connect, but give generation up to 30s
+        with _gemini_session.post(gemini_url, json=gemini_request, timeout=(5, 30), stream=True) as response:
+            if response.status_code != 200:
+                return jsonify({'error': f'Gemini API error: {response.text}'}), 500
+            
+            # Stopping early closes the unfinished connection instead of returning it to the
+            # keep-alive pool; saving the rest of the generation is worth a new handshake
+            ai_text = ''
+            # chunk_size=None yields data as it arrives rather than waiting to fill 512 bytes
+            for line in response.iter_lines(chunk_size=None):
+                # Server-sent events: each "data:" line carries one JSON chunk
+                if not line.startswith(b'data:'):
+                    continue
+                
+                candidates = orjson.loads(line[5:]).get('candidates')
+                if candidates:
+                    for part in candidates[0].get('content', {}).get('parts', []):
+                        ai_text += part.get('text', '')
+                
+                if has_all_ai_fields(ai_text):
+                    break
         
-        if not gemini_response.get('candidates') or len(gemini_response['candidates']) == 0:
+        if not ai_text:
             return jsonify({'error': 'No response from Gemini'}), 500
         
-        ai_text = gemini_response['candidates'][0]['content']['parts'][0]['text']
-        
-        # Parse the AI response
-        recommendation = 'A'
-        confidence = 50
-        reasoning = ai_text
-        
-        # Extract structured data from response
-        lines = ai_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('RECOMMENDATION:'):
-                rec = line.split(':', 1)[1].strip().upper()
-                if 'A' in rec:
-                    recommendation = 'A'
-                elif 'B' in rec:
-                    recommendation = 'B'
-            elif line.startswith('CONFIDENCE:'):
-                try:
-                    conf_str = line.split(':', 1)[1].strip().replace('%', '')
-                    confidence = int(conf_str)
-                except:
-                    pass
-            elif line.startswith('REASONING:'):
-                reasoning = line.split(':', 1)[1].strip()
+        recommendation, confidence, reasoning = parse_ai_advice(ai_text)
         
         return jsonify({
             'recommendation': recommendation,
@@ -335,4 +606,5 @@ Be concise and direct."""
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    # Development server only (already threaded); use gunicorn in production (see README)
     app.run(port=5002, debug=True)